@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+_DEFAULT_DIR = "~/.cache/autocase"
+_MAX_MEMORY_ENTRIES = 256
+
+
+@lru_cache(maxsize=None)
+def env_flag(name: str) -> Optional[bool]:
+    """Boolean value of environment variable name, None when unset."""
+    raw = os.getenv(name)
+    if raw is None:
+        return None
+    return raw.strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def cache_enabled(llm_config: Dict[str, Any]) -> bool:
+    """Whether the disk cache may be used for this run.
+
+    Precedence: --no-cache (the CLI-only `no_cache` key) > AUTOCASE_DISABLE_CACHE
+    > the `cache` config key.
+    """
+    if llm_config.get("no_cache"):
+        return False
+    disabled = env_flag("AUTOCASE_DISABLE_CACHE")
+    if disabled is None:
+        disabled = not bool(llm_config.get("cache", True))
+    return not disabled
+
+
+def cache_key(*parts: Any) -> str:
+    """Content hash of parts (JSON-encoded), used as a cache file name."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class DiskCache:
+    """JSON-value cache with one file per key and an in-process LRU in front.
+
+    Safe to share between threads; writes are atomic (temp file + rename).
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        value = data.get("value") if isinstance(data, dict) else None
+        if value is None:
+            return None
+        self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable, non-None value."""
+        self._remember(key, value)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            if len(self._memory) > _MAX_MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+
+
+_instances: Dict[str, DiskCache] = {}
+_instances_lock = threading.Lock()
+
+
+def get_cache() -> DiskCache:
+    """Shared cache for AUTOCASE_CACHE_DIR (default ~/.cache/autocase)."""
+    directory = os.path.expanduser(os.getenv("AUTOCASE_CACHE_DIR") or _DEFAULT_DIR)
+    with _instances_lock:
+        cache = _instances.get(directory)
+        if cache is None:
+            cache = _instances[directory] = DiskCache(directory)
+        return cache
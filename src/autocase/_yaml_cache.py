@@ -0,0 +1,43 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, List
+
+from ._cache import cache_key, get_cache
+from .parser import load_yaml_documents
+
+
+def load_yaml_cached(path: str, use_cache: bool = True) -> List[Any]:
+    """Return the parsed YAML documents of path.
+
+    Files whose mtime and size are unchanged since the last parse are served
+    from the shared disk cache (one entry per file), skipping the YAML parse.
+    With use_cache False the file is parsed and nothing is read or stored.
+    """
+    abs_path = os.path.abspath(path)
+    if not use_cache:
+        return load_yaml_documents(Path(abs_path).read_bytes())
+    stat = os.stat(abs_path)
+    cache = get_cache()
+    key = cache_key("yaml", abs_path)
+    entry = cache.get(key)
+    if (
+        isinstance(entry, list)
+        and len(entry) == 3
+        and entry[0] == stat.st_mtime
+        and entry[1] == stat.st_size
+    ):
+        return entry[2]
+
+    # PyYAML decodes bytes itself (inside libyaml when available), so skip the
+    # separate str decode.
+    docs = load_yaml_documents(Path(abs_path).read_bytes())
+    # YAML can yield values JSON cannot represent faithfully (dates, int keys);
+    # such files are simply re-parsed next run.
+    try:
+        cacheable = json.loads(json.dumps(docs)) == docs
+    except (TypeError, ValueError):
+        cacheable = False
+    if cacheable:
+        cache.set(key, [stat.st_mtime, stat.st_size, docs])
+    return docs
@@ -1,20 +1,29 @@
 import argparse
-import csv
 import json
 import os
 import sys
 import time
-from typing import Optional, List, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Optional, List, Iterable, Tuple
 
-from .parser import parse_casespecs_yaml, load_yaml
-from .generator import to_excel_rows, TestCase, llm_items_to_cases, cases_to_json
-from .llm_client import generate_llm_cases, generate_module_code
+from .parser import (
+    CaseSpec,
+    casespecs_from_documents,
+    config_from_documents,
+    libyaml_missing,
+    parse_casespecs_yaml,
+)
+from ._cache import cache_enabled
+from ._yaml_cache import load_yaml_cached
 
-try:
-    import openpyxl
-    from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
-except Exception:  # pragma: no cover - optional import guard
-    openpyxl = None
+if TYPE_CHECKING:
+    from .generator import TestCase
+
+# openpyxl, csv, the generator and the LLM client (which pulls in the openai
+# SDK) are imported only on the paths that use them, keeping `autocase -h`
+# and the other early exits fast.
+
+_CSV_BUFFER_SIZE = 1 << 20
 
 
 def _read_input(path: Optional[str]) -> str:
@@ -70,14 +79,18 @@ def _print_banner() -> None:
         print(meta)
 
 
-def _supports_color() -> bool:
-    return sys.stderr.isatty() and os.getenv("NO_COLOR") is None
+# stderr's tty-ness and NO_COLOR do not change during a run; deciding once
+# keeps isatty()/getenv out of every log line and progress frame.
+_COLOR = sys.stderr.isatty() and os.getenv("NO_COLOR") is None
+_RESET = "\033[0m" if _COLOR else ""
+_STEP_PREFIX = "\033[1;38;5;40m" if _COLOR else ""
+_TEXT_PREFIX = "\033[38;5;252m" if _COLOR else ""
 
 
 def _color(text: str, code: str) -> str:
-    if not _supports_color():
+    if not _COLOR:
         return text
-    return f"\033[{code}m{text}\033[0m"
+    return f"\033[{code}m{text}{_RESET}"
 
 
 def _log_header(title: str) -> None:
@@ -93,10 +106,20 @@ def _log_kv(key: str, value: str) -> None:
     print(f"  {k} {v}", file=sys.stderr)
 
 
+def _step_line(prefix: str, message: str) -> str:
+    return f"{_STEP_PREFIX}{prefix}{_RESET} {_TEXT_PREFIX}{message}{_RESET}"
+
+
 def _log_step(prefix: str, message: str) -> None:
-    p = _color(prefix, "1;38;5;40")
-    m = _color(message, "38;5;252")
-    print(f"  {p} {m}", file=sys.stderr)
+    print(f"  {_step_line(prefix, message)}", file=sys.stderr)
+
+
+def _log_progress(prefix: str, message: str, done: bool = False) -> None:
+    # With colour the line is redrawn in place; otherwise each update is a log line.
+    if _COLOR:
+        _progress_update(_step_line(prefix, message), done)
+    else:
+        _log_step(prefix, message)
 
 
 def _log_level(level: str, message: str) -> None:
@@ -116,14 +139,14 @@ def _progress_bar(current: int, total: int, width: int = 24) -> str:
 
 
 def _progress_update(line: str, done: bool = False) -> None:
-    if not _supports_color():
+    if not _COLOR:
         return
     end = "\n" if done else ""
-    sys.stderr.write("\r" + line + (" " * 4) + end)
+    sys.stderr.write(f"\r{line}    {end}")
     sys.stderr.flush()
 
 
-def _load_module_cache(path: str) -> dict:
+def _load_json_cache(path: str) -> dict:
     try:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
@@ -132,14 +155,47 @@ def _load_module_cache(path: str) -> dict:
         return {}
 
 
-def _save_module_cache(path: str, data: dict) -> None:
+def _save_json_cache(path: str, data: dict) -> None:
+    # Write a temp file then rename, so an interrupted run never leaves a
+    # truncated cache behind.
+    tmp_path = f"{path}.tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
     except Exception:
         pass
 
 
+def _write_cases_json_stdout(cases: List["TestCase"]) -> None:
+    from .generator import cases_to_json
+
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    out = getattr(sys.stdout, "buffer", None)
+    if orjson is None or out is None:
+        print(json.dumps(cases_to_json(cases), ensure_ascii=False, indent=2))
+        return
+    # orjson serializes the TestCase dataclasses natively (fields in
+    # declaration order, same keys as cases_to_json) without building
+    # intermediate dicts, and already yields UTF-8 bytes; skip the text layer.
+    sys.stdout.flush()
+    out.write(orjson.dumps(cases, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    out.flush()
+
+
+def _generate_timed(
+    spec: CaseSpec, llm_config: dict, prompt_text: str
+) -> Tuple[List[dict], float]:
+    from .llm_client import generate_llm_cases
+
+    step_start = time.perf_counter()
+    llm_items = generate_llm_cases(spec, llm_config, prompt_text)
+    return llm_items, time.perf_counter() - step_start
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="AutoCase - 生成标准测试用例表格(Excel/CSV)")
     parser.add_argument(
@@ -169,6 +225,11 @@ def main() -> int:
         action="store_true",
         help="关闭启动Banner显示",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="不读写磁盘缓存（大模型响应与已解析的YAML），重新生成",
+    )
     parser.add_argument(
         "--json-only",
         action="store_true",
@@ -217,6 +278,9 @@ def main() -> int:
     elif not os.path.isabs(output_path):
         output_path = os.path.join(output_dir, output_path)
 
+    if libyaml_missing():
+        _log_level("WARN", "PyYAML 未启用 libyaml，YAML 解析较慢；建议安装带 libyaml 的 PyYAML")
+
     _log_header("Inputs")
     if input_paths:
         _log_kv("Count", str(len(input_paths)))
@@ -230,9 +294,12 @@ def main() -> int:
     if not os.path.exists(args.llm_config):
         print(f"LLM 配置文件不存在: {args.llm_config}", file=sys.stderr)
         return 2
-    llm_text = _read_input(args.llm_config)
     try:
-        llm_config = load_yaml(llm_text)
+        # The config's own `cache` key is unknown until it is parsed, so only
+        # --no-cache and AUTOCASE_DISABLE_CACHE apply to llm.yaml itself.
+        llm_config = config_from_documents(
+            load_yaml_cached(args.llm_config, cache_enabled({"no_cache": args.no_cache}))
+        )
     except ValueError as e:
         print(f"LLM 配置错误: {e}", file=sys.stderr)
         return 2
@@ -240,6 +307,13 @@ def main() -> int:
     if not bool(llm_config.get("enabled", True)):
         print("LLM 已禁用，请在 llm.yaml 中设置 enabled: true", file=sys.stderr)
         return 2
+    concurrency = llm_config.get("concurrency", 4)
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+        print("LLM 配置错误: concurrency 必须是正整数", file=sys.stderr)
+        return 2
+    if args.no_cache:
+        # Copy: the parsed config object is shared through the YAML cache.
+        llm_config = {**llm_config, "no_cache": True}
 
     _log_kv("Prompt", args.prompt)
     if not os.path.exists(args.prompt):
@@ -265,13 +339,13 @@ def main() -> int:
         all_specs.extend(specs)
     else:
         for p in input_paths:
-            text = _read_input(p)
-            if not text.strip():
+            docs = load_yaml_cached(p, cache_enabled(llm_config))
+            if not docs:
                 print(f"未读取到输入内容: {p}", file=sys.stderr)
                 return 2
             try:
                 _log_step("✓", f"Parse YAML: {os.path.basename(p)}")
-                specs = parse_casespecs_yaml(text)
+                specs = casespecs_from_documents(docs)
             except ValueError as e:
                 print(f"{p} 解析失败: {e}", file=sys.stderr)
                 return 2
@@ -279,63 +353,76 @@ def main() -> int:
                 spec.source = os.path.basename(p)
             all_specs.extend(specs)
 
-    module_code_cache = {}
-    cache_path = ".autocase_module_cache.json"
-    module_code_cache.update(_load_module_cache(cache_path))
-    for spec in all_specs:
-        if not spec.module_code:
-            if spec.module not in module_code_cache:
-                try:
-                    module_code_cache[spec.module] = generate_module_code(
-                        spec.module, llm_config
-                    )
-                    _log_level(
-                        "INFO",
-                        f"模块缩写生成: {spec.module} -> {module_code_cache[spec.module]}",
-                    )
-                except Exception as e:
-                    _log_level(
-                        "WARN",
-                        f"模块缩写生成失败: {spec.module} ({e})，使用 MOD",
-                    )
-                    module_code_cache[spec.module] = "MOD"
-            spec.module_code = module_code_cache[spec.module]
-    _save_module_cache(cache_path, module_code_cache)
+    from .generator import (
+        iter_excel_rows,
+        llm_items_to_cases,
+        to_excel_rows,
+    )
+    from .llm_client import generate_module_code
+
+    module_cache_path = ".autocase_module_cache.json"
+    module_code_cache = _load_json_cache(module_cache_path)
+    missing_modules = list(
+        dict.fromkeys(
+            spec.module
+            for spec in all_specs
+            if not spec.module_code and spec.module not in module_code_cache
+        )
+    )
 
-    cases: List[TestCase] = []
+    results: List[List[dict]] = [[] for _ in all_specs]
+    cases: List["TestCase"] = []
     next_index = 1
     total = len(all_specs)
+    workers = max(1, min(concurrency, total + len(missing_modules)))
     _log_header("Generation")
-    for idx, spec in enumerate(all_specs, start=1):
-        step_start = time.perf_counter()
-        bar = _progress_bar(idx - 1, total)
-        display_src = spec.source or "STDIN"
-        display_title = f"{display_src} | {spec.feature}"
-        if _supports_color():
-            line = _color("▸", "1;38;5;40") + " " + _color(
-                f"{bar}  {idx}/{total} | {display_title}  (start)",
-                "38;5;252",
-            )
-            _progress_update(line)
-        else:
-            _log_step("▸", f"{bar}  {idx}/{total} | {display_title}  (start)")
-        try:
-            llm_items = generate_llm_cases(spec, llm_config, prompt_text)
-            llm_cases, next_index = llm_items_to_cases(llm_items, spec, next_index)
-            cases.extend(llm_cases)
-        except Exception as e:
-            _log_level("ERROR", f"LLM 生成失败: {e}")
-            return 2
-        step_elapsed = time.perf_counter() - step_start
-        bar_done = _progress_bar(idx, total)
-        if _supports_color():
-            line = _color("✓", "1;38;5;40") + " " + _color(
-                f"{bar_done}  {idx}/{total} | {display_title}  ({step_elapsed:.2f}s)",
-                "38;5;252",
+    bar = _progress_bar(0, total)
+    _log_progress("▸", f"{bar}  0/{total} | {workers} worker(s)  (start)")
+    # LLM calls are network-bound, so threads overlap them (module-code lookups
+    # share the pool); results are kept in spec order so case IDs stay
+    # identical to a serial run.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        module_futures = {
+            executor.submit(generate_module_code, module, llm_config): module
+            for module in missing_modules
+        }
+        futures = {
+            executor.submit(_generate_timed, all_specs[idx], llm_config, prompt_text): idx
+            for idx in range(total)
+        }
+        for done_count, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            spec = all_specs[idx]
+            try:
+                results[idx], step_elapsed = future.result()
+            except Exception as e:
+                for other in (*module_futures, *futures):
+                    other.cancel()
+                _log_level("ERROR", f"LLM 生成失败: {e}")
+                return 2
+            display_src = spec.source or "STDIN"
+            display_title = f"{display_src} | {spec.feature}"
+            bar_done = _progress_bar(done_count, total)
+            _log_progress(
+                "✓",
+                f"{bar_done}  {done_count}/{total} | {display_title}  ({step_elapsed:.2f}s)",
+                done=True,
             )
-            _progress_update(line, done=True)
-        else:
-            _log_step("✓", f"{bar_done}  {idx}/{total} | {display_title}  ({step_elapsed:.2f}s)")
+        # Logged after the progress lines so they do not break the redraw.
+        for future, module in module_futures.items():
+            try:
+                module_code_cache[module] = future.result()
+                _log_level("INFO", f"模块缩写生成: {module} -> {module_code_cache[module]}")
+            except Exception as e:
+                _log_level("WARN", f"模块缩写生成失败: {module} ({e})，使用 MOD")
+                module_code_cache[module] = "MOD"
+    _save_json_cache(module_cache_path, module_code_cache)
+    for spec in all_specs:
+        if not spec.module_code:
+            spec.module_code = module_code_cache[spec.module]
+    for spec, llm_items in zip(all_specs, results):
+        llm_cases, next_index = llm_items_to_cases(llm_items, spec, next_index)
+        cases.extend(llm_cases)
     if args.json_only:
         elapsed = time.perf_counter() - start_ts
         _log_header("Result")
@@ -343,7 +430,7 @@ def main() -> int:
         _log_kv("Output", "JSON to STDOUT (no Excel)")
         _log_kv("Elapsed", f"{elapsed:.2f}s  ⏱️")
         _log_kv("Status", "done  ✅")
-        print(json.dumps(cases_to_json(cases), ensure_ascii=False, indent=2))
+        _write_cases_json_stdout(cases)
         return 0
 
     output_parent = os.path.dirname(output_path)
@@ -352,52 +439,73 @@ def main() -> int:
 
     _log_header("Output")
     _log_kv("Write", output_path)
-    rows = to_excel_rows(cases)
     output_ext = os.path.splitext(output_path)[1].lower()
     if output_ext == ".csv":
-        with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
+        import csv
+
+        # A large buffer turns many small per-row writes into a few big ones.
+        with open(
+            output_path, "w", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE
+        ) as f:
             writer = csv.writer(f)
-            writer.writerows(rows)
+            writer.writerows(iter_excel_rows(cases))
         print(f"已生成: {output_path}")
         return 0
 
-    if openpyxl is None:
+    try:
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill, Border, Side
+        from openpyxl.utils import get_column_letter
+    except ImportError:
         print("缺少依赖: openpyxl，请先安装依赖", file=sys.stderr)
         return 2
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "TestCases"
-    for row in rows:
-        ws.append(row)
-
     # Styling
     header_fill = PatternFill("solid", fgColor="E8EEF7")
     header_font = Font(bold=True)
     thin = Side(border_style="thin", color="CBD5E1")
     border = Border(left=thin, right=thin, top=thin, bottom=thin)
     wrap = Alignment(wrap_text=True, vertical="top")
-
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in row:
-            cell.alignment = wrap
-            cell.border = border
-            if cell.row == 1:
-                cell.fill = header_fill
-                cell.font = header_font
-            elif cell.row % 2 == 0:
-                cell.fill = PatternFill("solid", fgColor="F8FAFC")
-
+    alt_fill = PatternFill("solid", fgColor="F8FAFC")
+
+    # Write-only mode streams rows straight to disk, so sheet-level settings
+    # (column widths, frozen panes) must be in place before the first row;
+    # unlike CSV, the rows are therefore built up front to size the columns.
+    rows, col_widths = to_excel_rows(cases)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("TestCases")
+    for j, w in enumerate(col_widths):
+        ws.column_dimensions[get_column_letter(j + 1)].width = min(w + 2, 60)
     ws.freeze_panes = "A2"
-    ws.auto_filter.ref = ws.dimensions
-
-    # Column widths
-    for col in ws.columns:
-        max_len = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            if cell.value:
-                max_len = max(max_len, len(str(cell.value)))
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 60)
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(col_widths))}{len(rows)}"
+
+    # Styling depends only on the row kind, so each cell takes one of three
+    # registered named styles instead of four per-attribute style lookups.
+    header_style = NamedStyle(
+        name="autocase_header",
+        fill=header_fill,
+        font=header_font,
+        border=border,
+        alignment=wrap,
+    )
+    alt_style = NamedStyle(name="autocase_alt", fill=alt_fill, border=border, alignment=wrap)
+    body_style = NamedStyle(name="autocase_body", border=border, alignment=wrap)
+    for style in (header_style, alt_style, body_style):
+        wb.add_named_style(style)
+
+    for i, row in enumerate(rows):
+        if i == 0:
+            style_name = header_style.name
+        elif i % 2:
+            style_name = alt_style.name
+        else:
+            style_name = body_style.name
+        cells = []
+        for v in row:
+            cell = WriteOnlyCell(ws, value=v)
+            cell.style = style_name
+            cells.append(cell)
+        ws.append(cells)
 
     wb.save(output_path)
     print(f"已生成: {output_path}")
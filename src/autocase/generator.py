@@ -1,11 +1,28 @@
+import re
 from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from .parser import CaseSpec
 
 
 @dataclass
 class TestCase:
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10): one
+    # instance per generated case, so drop the per-instance __dict__.
+    __slots__ = (
+        "case_id",
+        "module",
+        "case_type",
+        "name",
+        "priority",
+        "preconditions",
+        "steps",
+        "expected",
+        "keywords",
+        "stage",
+    )
+
     case_id: str
     module: str
     case_type: str
@@ -27,39 +44,68 @@ _ALLOWED_STAGES = [
     "版本验证阶段",
 ]
 
-
-def to_excel_rows(cases: List[TestCase]) -> List[List[str]]:
-    headers = [
-        "用例ID",
-        "所属模块",
-        "用例名称",
-        "前置条件",
-        "步骤",
-        "预期",
-        "关键词",
-        "优先级",
-        "用例类型",
-        "适用阶段",
-    ]
-    rows = [headers]
+# "1. " .. "99. " prefixes, so numbering lines needs no per-line formatting.
+_NUM_PREFIX = [f"{i}. " for i in range(1, 100)]
+
+# Everything except ASCII letters, digits, "-" and "_" separates words (the
+# C regex engine replaces the per-character scan).
+_MODULE_SEPARATOR_RE = re.compile(r"[^A-Za-z0-9_\-]+")
+
+_HEADERS: Tuple[str, ...] = (
+    "用例ID",
+    "所属模块",
+    "用例名称",
+    "前置条件",
+    "步骤",
+    "预期",
+    "关键词",
+    "优先级",
+    "用例类型",
+    "适用阶段",
+)
+
+
+def _numbered(lines: List[str]) -> str:
+    # str.join materializes its input anyway, so a list is cheaper than a generator.
+    return "\n".join(
+        [_NUM_PREFIX[i] + s if i < 99 else f"{i + 1}. {s}" for i, s in enumerate(lines)]
+    )
+
+
+def iter_excel_rows(cases: Iterable[TestCase]) -> Iterator[List[str]]:
+    """Yield the header row, then one sheet row per case."""
+    yield list(_HEADERS)
     for c in cases:
-        steps_text = "\n".join([f"{i + 1}. {s}" for i, s in enumerate(c.steps)])
-        expected_text = "\n".join([f"{i + 1}. {s}" for i, s in enumerate(c.expected)])
-        rows.append(
-            [
-                c.case_id,
-                c.module,
-                c.name,
-                c.preconditions,
-                steps_text,
-                expected_text,
-                c.keywords,
-                c.priority,
-                c.case_type,
-                c.stage,
-            ]
-        )
-    return rows
+        yield [
+            c.case_id,
+            c.module,
+            c.name,
+            c.preconditions,
+            _numbered(c.steps),
+            _numbered(c.expected),
+            c.keywords,
+            c.priority,
+            c.case_type,
+            c.stage,
+        ]
+
+
+def to_excel_rows(cases: List[TestCase]) -> Tuple[List[List[str]], List[int]]:
+    """Build sheet rows (header first) and the max text length of each column.
+
+    Widths are tracked while the rows are built so writers need no extra pass.
+    """
+    rows: List[List[str]] = []
+    col_widths: List[int] = []
+    for row in iter_excel_rows(cases):
+        if not col_widths:
+            col_widths = [0] * len(row)
+        for j, v in enumerate(row):
+            length = len(v) if isinstance(v, str) else len(str(v))
+            if length > col_widths[j]:
+                col_widths[j] = length
+        rows.append(row)
+    return rows, col_widths
 
 
 def cases_to_json(cases: List[TestCase]) -> List[Dict[str, Any]]:
@@ -84,13 +130,13 @@ def cases_to_json(cases: List[TestCase]) -> List[Dict[str, Any]]:
 
 def _normalize_list(value: Any) -> List[str]:
     if isinstance(value, list):
-        return [str(v).strip() for v in value if str(v).strip()]
+        return [text for text in [str(v).strip() for v in value] if text]
     if isinstance(value, str):
         text = value.strip()
         if not text:
             return []
         if "\n" in text:
-            return [line.strip() for line in text.splitlines() if line.strip()]
+            return [line for line in [raw.strip() for raw in text.splitlines()] if line]
         return [text]
     if value is None:
         return []
@@ -106,28 +152,29 @@ def llm_items_to_cases(
     next_index = start_index
     module_code = _derive_module_code(spec)
     module_label = _module_label(spec.module)
+    label_tag = f"[{module_label}]" if module_label else ""
+    keywords_text = ", ".join(spec.keywords)
     for item in items:
         type_value = item.get("type", [])
         if isinstance(type_value, list):
             type_value = ", ".join(type_value)
-        raw_steps = item.get("steps", [])
-        steps_list = _normalize_list(raw_steps)
-        if len(steps_list) > 4:
-            steps_list = steps_list[:4]
-        raw_expected = item.get("expected", [])
-        expected_list = _normalize_list(raw_expected)
-        if len(expected_list) < len(steps_list):
-            expected_list += [""] * (len(steps_list) - len(expected_list))
-        elif len(expected_list) > len(steps_list):
-            expected_list = expected_list[: len(steps_list)]
+        # Trim/pad in place: both lists are freshly built by _normalize_list.
+        steps_list = _normalize_list(item.get("steps", []))
+        del steps_list[4:]
+        expected_list = _normalize_list(item.get("expected", []))
+        shortfall = len(steps_list) - len(expected_list)
+        if shortfall > 0:
+            expected_list.extend([""] * shortfall)
+        else:
+            del expected_list[len(steps_list) :]
 
         stage_value = item.get("stage", item.get("适用阶段", ""))
         stage_text = str(stage_value).strip()
         if stage_text not in _ALLOWED_STAGES:
             stage_text = "功能测试阶段"
         name = str(item.get("name", ""))
-        if module_label and not name.startswith(f"[{module_label}]"):
-            name = f"[{module_label}] {name}"
+        if label_tag and not name.startswith(label_tag):
+            name = f"{label_tag} {name}"
         cases.append(
             TestCase(
                 case_id=f"{module_code}-{next_index:04d}",
@@ -138,7 +185,7 @@ def llm_items_to_cases(
                 preconditions=str(item.get("pre", "")),
                 steps=steps_list,
                 expected=expected_list,
-                keywords=", ".join(spec.keywords),
+                keywords=keywords_text,
                 stage=stage_text,
             )
         )
@@ -146,16 +193,8 @@ def llm_items_to_cases(
     return cases, next_index
 
 
-def _normalize_numbered_text(text: str) -> str:
-    cleaned = text.strip()
-    if not cleaned:
-        return ""
-    lines = [line.strip() for line in cleaned.splitlines() if line.strip()]
-    if len(lines) <= 1:
-        return f"1. {cleaned}"
-    return "\n".join([f"{i + 1}. {line}" for i, line in enumerate(lines)])
-
-
+# Module names repeat across specs, so the label/code derivations are memoized.
+@lru_cache(maxsize=256)
 def _module_label(module: str) -> str:
     if not module:
         return ""
@@ -164,17 +203,16 @@ def _module_label(module: str) -> str:
 
 
 def _derive_module_code(spec: CaseSpec) -> str:
-    raw = (spec.module_code or "").strip()
+    return _module_code_from(spec.module_code or "", spec.module)
+
+
+@lru_cache(maxsize=256)
+def _module_code_from(module_code: str, module: str) -> str:
+    raw = module_code.strip()
     if raw:
         return raw.upper()
     # Fallback: keep ASCII letters/digits from module, use initials.
-    cleaned = []
-    for ch in spec.module:
-        if ch.isascii() and (ch.isalnum() or ch in (" ", "-", "_", "/")):
-            cleaned.append(ch)
-        else:
-            cleaned.append(" ")
-    words = [w for w in "".join(cleaned).replace("/", " ").split() if w]
+    words = _MODULE_SEPARATOR_RE.sub(" ", module).split()
     if not words:
         return "MOD"
     initials = "".join([w[0] for w in words]).upper()
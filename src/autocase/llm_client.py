@@ -1,37 +1,51 @@
 import json
 import os
-from typing import Any, Dict, List, Optional
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from openai import OpenAI
 except Exception:  # pragma: no cover - optional import guard
     OpenAI = None
 
+try:
+    import jiter
+except Exception:  # pragma: no cover - optional import guard
+    jiter = None
+
+from ._cache import DiskCache, cache_enabled, cache_key, env_flag, get_cache
 from .parser import CaseSpec
 
 
-def _env_flag(name: str) -> Optional[bool]:
-    raw = os.getenv(name)
-    if raw is None:
-        return None
-    return raw.strip().lower() in ("1", "true", "yes", "y", "on")
+_JSON_DECODER = json.JSONDecoder()
 
+# One client per (api_key, base_url): reusing it keeps the HTTP connection
+# pool (TLS sessions, keep-alive) across calls and worker threads.
+_CLIENT_CACHE: Dict[Tuple[str, str], Any] = {}
+_CLIENT_LOCK = threading.Lock()
 
-def generate_llm_cases(
-    spec: CaseSpec,
-    llm_config: Dict[str, Any],
-    system_prompt: str,
-) -> List[Dict[str, Any]]:
-    if OpenAI is None:
-        raise RuntimeError("缺少依赖: openai，请先安装依赖")
+# Chain-of-thought wrappers some models emit around (or instead of) the answer.
+# Precompiled so each response is scanned once by the C regex engine.
+_THINK_BLOCK_RE = re.compile(r"<(think|analysis)>.*?</\1>", re.DOTALL)
+_THINK_OPEN_RE = re.compile(r"<(?:think|analysis)>")
+# An unclosed block runs to the end of the text.
+_THINK_CONTENT_RE = re.compile(r"<(think|analysis)>(.*?)(?:</\1>|\Z)", re.DOTALL)
 
-    api_key_env = os.getenv(
-        "AUTOCASE_API_KEY_ENV",
-        llm_config.get("api_key_env", "OPENAI_API_KEY"),
-    )
-    allow_empty_key = _env_flag("AUTOCASE_ALLOW_EMPTY_KEY")
+
+@lru_cache(maxsize=32)
+def _resolve_runtime(
+    api_key_env_cfg: str,
+    base_url_cfg: str,
+    model_cfg: str,
+    allow_empty_key_cfg: bool,
+    api_mode_cfg: str,
+) -> Tuple[str, Optional[str], str, str]:
+    api_key_env = os.getenv("AUTOCASE_API_KEY_ENV", api_key_env_cfg)
+    allow_empty_key = env_flag("AUTOCASE_ALLOW_EMPTY_KEY")
     if allow_empty_key is None:
-        allow_empty_key = bool(llm_config.get("allow_empty_key", False))
+        allow_empty_key = allow_empty_key_cfg
     api_key = None
     if api_key_env:
         api_key = os.getenv(api_key_env)
@@ -41,13 +55,73 @@ def generate_llm_cases(
     if not api_key and allow_empty_key:
         # OpenAI SDK still requires a non-empty api_key; local compatible servers can ignore it.
         api_key = "EMPTY"
+    base_url = os.getenv("AUTOCASE_BASE_URL", base_url_cfg) or None
+    model = os.getenv("AUTOCASE_MODEL", model_cfg)
+    api_mode = os.getenv("AUTOCASE_API_MODE", api_mode_cfg)
+    return api_key, base_url, model, api_mode
+
+
+def _runtime(llm_config: Dict[str, Any]) -> Tuple[str, Optional[str], str, str]:
+    """Return (api_key, base_url, model, api_mode) after env overrides."""
+    if OpenAI is None:
+        raise RuntimeError("缺少依赖: openai，请先安装依赖")
+    return _resolve_runtime(
+        llm_config.get("api_key_env", "OPENAI_API_KEY"),
+        llm_config.get("base_url") or "",
+        llm_config.get("model", "gpt-4o-mini"),
+        bool(llm_config.get("allow_empty_key", False)),
+        llm_config.get("api_mode", "responses"),
+    )
+
+
+def _get_client(api_key: str, base_url: Optional[str]) -> Any:
+    key = (api_key, base_url or "")
+    with _CLIENT_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client_kwargs = {"api_key": api_key}
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            client = _CLIENT_CACHE[key] = OpenAI(**client_kwargs)
+        return client
+
+
+def _call_kwargs(llm_config: Dict[str, Any], api_mode: str) -> Dict[str, Any]:
+    # Sampling parameters in the shape the selected API expects.
+    max_tokens_key = "max_tokens" if api_mode == "chat_completions" else "max_output_tokens"
+    return {
+        "temperature": llm_config.get("temperature", 0.2),
+        max_tokens_key: llm_config.get("max_tokens", 2000),
+        "top_p": llm_config.get("top_p", 1.0),
+        "frequency_penalty": llm_config.get("frequency_penalty", 0.0),
+        "presence_penalty": llm_config.get("presence_penalty", 0.0),
+    }
+
+
+def _response_cache(llm_config: Dict[str, Any]) -> Optional[DiskCache]:
+    return get_cache() if cache_enabled(llm_config) else None
+
+
+def _response_key(
+    model: str,
+    base_url: Optional[str],
+    api_mode: str,
+    call_kwargs: Dict[str, Any],
+    system_prompt: str,
+    user_prompt: str,
+) -> str:
+    # Everything that shapes the model's answer; the API key deliberately not.
+    return cache_key(model, base_url, api_mode, call_kwargs, system_prompt, user_prompt)
 
-    base_url = os.getenv("AUTOCASE_BASE_URL", llm_config.get("base_url") or "") or None
-    client_kwargs = {"api_key": api_key}
-    if base_url:
-        client_kwargs["base_url"] = base_url
-    client = OpenAI(**client_kwargs)
-    model = os.getenv("AUTOCASE_MODEL", llm_config.get("model", "gpt-4o-mini"))
+
+def generate_llm_cases(
+    spec: CaseSpec,
+    llm_config: Dict[str, Any],
+    system_prompt: str,
+) -> List[Dict[str, Any]]:
+    api_key, base_url, model, api_mode = _runtime(llm_config)
+    client = _get_client(api_key, base_url)
+    call_kwargs = _call_kwargs(llm_config, api_mode)
 
     user_prompt = _build_user_prompt(spec)
     max_retries = int(llm_config.get("retry_count", 2))
@@ -56,14 +130,22 @@ def generate_llm_cases(
         "再次提醒：只输出JSON数组，不要包含任何解释或其它文本。",
     )
 
-    debug_log = _env_flag("AUTOCASE_DEBUG_LOG")
+    debug_log = env_flag("AUTOCASE_DEBUG_LOG")
     if debug_log is None:
         debug_log = bool(llm_config.get("debug_log", False))
+    cache = _response_cache(llm_config)
     for attempt in range(max_retries + 1):
         prompt = user_prompt if attempt == 0 else f"{user_prompt}\n\n{retry_suffix}"
-        text = _call_model(client, model, llm_config, system_prompt, prompt)
+        key = _response_key(model, base_url, api_mode, call_kwargs, system_prompt, prompt)
+        cached = cache.get(key) if cache else None
+        text = cached if cached is not None else _call_model(
+            client, model, api_mode, call_kwargs, system_prompt, prompt
+        )
         items = _parse_json_list(text)
         if items:
+            # Only usable answers are cached, so a bad reply is never replayed.
+            if cache and cached is None:
+                cache.set(key, text)
             return items
         if debug_log:
             _log_invalid_response(text, attempt)
@@ -95,11 +177,11 @@ def _build_user_prompt(spec: CaseSpec) -> str:
 def _call_model(
     client: OpenAI,
     model: str,
-    llm_config: Dict[str, Any],
+    api_mode: str,
+    call_kwargs: Dict[str, Any],
     system_prompt: str,
     user_prompt: str,
 ) -> str:
-    api_mode = os.getenv("AUTOCASE_API_MODE", llm_config.get("api_mode", "responses"))
     if api_mode == "chat_completions":
         response = client.chat.completions.create(
             model=model,
@@ -107,22 +189,14 @@ def _call_model(
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            temperature=llm_config.get("temperature", 0.2),
-            max_tokens=llm_config.get("max_tokens", 2000),
-            top_p=llm_config.get("top_p", 1.0),
-            frequency_penalty=llm_config.get("frequency_penalty", 0.0),
-            presence_penalty=llm_config.get("presence_penalty", 0.0),
+            **call_kwargs,
         )
         return _extract_chat_text(response)
     response = client.responses.create(
         model=model,
         instructions=system_prompt,
         input=user_prompt,
-        temperature=llm_config.get("temperature", 0.2),
-        max_output_tokens=llm_config.get("max_tokens", 2000),
-        top_p=llm_config.get("top_p", 1.0),
-        frequency_penalty=llm_config.get("frequency_penalty", 0.0),
-        presence_penalty=llm_config.get("presence_penalty", 0.0),
+        **call_kwargs,
     )
     return _extract_text(response)
 
@@ -145,27 +219,33 @@ def _extract_chat_text(response: Any) -> str:
         return ""
 
 
+def _loads(text: str) -> Any:
+    # jiter (the Rust JSON parser the openai SDK already depends on) decodes
+    # model output several times faster than the stdlib json module.
+    if jiter is None:
+        return json.loads(text)
+    return jiter.from_json(text.encode("utf-8"), cache_mode="keys")
+
+
 def _parse_json_list(text: str) -> List[Dict[str, Any]]:
     text = _strip_think(text).strip()
     if not text:
         return []
     try:
-        data = json.loads(text)
-        if isinstance(data, list):
-            return [d for d in data if isinstance(d, dict)]
+        data = _loads(text)
     except Exception:
-        # Try to salvage a JSON array embedded in other text (e.g., with <think>).
+        # Salvage a JSON array embedded in other text: decode from the first
+        # "[" and ignore whatever follows the array, in one scan. jiter's
+        # partial mode would also accept a truncated array, so it is not used.
         start = text.find("[")
-        end = text.rfind("]")
-        if start != -1 and end != -1 and end > start:
-            snippet = text[start : end + 1]
-            try:
-                data = json.loads(snippet)
-                if isinstance(data, list):
-                    return [d for d in data if isinstance(d, dict)]
-            except Exception:
-                return []
-        return []
+        if start == -1:
+            return []
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            return []
+    if isinstance(data, list):
+        return [d for d in data if isinstance(d, dict)]
     return []
 
 
@@ -173,31 +253,9 @@ def generate_module_code(
     module_name: str,
     llm_config: Dict[str, Any],
 ) -> str:
-    if OpenAI is None:
-        raise RuntimeError("缺少依赖: openai，请先安装依赖")
-
-    api_key_env = os.getenv(
-        "AUTOCASE_API_KEY_ENV",
-        llm_config.get("api_key_env", "OPENAI_API_KEY"),
-    )
-    allow_empty_key = _env_flag("AUTOCASE_ALLOW_EMPTY_KEY")
-    if allow_empty_key is None:
-        allow_empty_key = bool(llm_config.get("allow_empty_key", False))
-    api_key = None
-    if api_key_env:
-        api_key = os.getenv(api_key_env)
-    if not api_key and not allow_empty_key:
-        missing = api_key_env or "(empty)"
-        raise RuntimeError(f"未找到API Key环境变量: {missing}")
-    if not api_key and allow_empty_key:
-        api_key = "EMPTY"
-
-    base_url = os.getenv("AUTOCASE_BASE_URL", llm_config.get("base_url") or "") or None
-    client_kwargs = {"api_key": api_key}
-    if base_url:
-        client_kwargs["base_url"] = base_url
-    client = OpenAI(**client_kwargs)
-    model = os.getenv("AUTOCASE_MODEL", llm_config.get("model", "gpt-4o-mini"))
+    api_key, base_url, model, api_mode = _runtime(llm_config)
+    client = _get_client(api_key, base_url)
+    call_kwargs = _call_kwargs(llm_config, api_mode)
 
     prompt = (
         "请为以下中文模块名称生成一个英文缩写前缀，要求：\n"
@@ -206,12 +264,20 @@ def generate_module_code(
         f"模块名称: {module_name}\n"
         "输出示例: ORG"
     )
-    text = _call_model(client, model, llm_config, "你是缩写生成器。", prompt)
+    system_prompt = "你是缩写生成器。"
+    cache = _response_cache(llm_config)
+    key = _response_key(model, base_url, api_mode, call_kwargs, system_prompt, prompt)
+    cached = cache.get(key) if cache else None
+    text = cached if cached is not None else _call_model(
+        client, model, api_mode, call_kwargs, system_prompt, prompt
+    )
     cleaned = _strip_think(text).strip().upper()
     # Extract leading letters
     letters = "".join([ch for ch in cleaned if ch.isalpha()])
     if len(letters) < 2:
         return "MOD"
+    if cache and cached is None:
+        cache.set(key, text)
     return letters[:6]
 
 
@@ -237,35 +303,13 @@ def _strip_think(text: str) -> str:
     # Remove common chain-of-thought wrapper tags.
     if not text:
         return ""
-    cleaned = text
-    for open_tag, close_tag in (("<think>", "</think>"), ("<analysis>", "</analysis>")):
-        while True:
-            start = cleaned.find(open_tag)
-            if start == -1:
-                break
-            end = cleaned.find(close_tag, start + len(open_tag))
-            if end == -1:
-                # If unclosed, remove the tag and continue (best-effort preserve content).
-                cleaned = cleaned[:start] + cleaned[start + len(open_tag) :]
-                break
-            cleaned = cleaned[:start] + cleaned[end + len(close_tag) :]
-    return cleaned
+    cleaned = _THINK_BLOCK_RE.sub("", text)
+    # If unclosed, remove the tag only (best-effort preserve content).
+    return _THINK_OPEN_RE.sub("", cleaned)
 
 
 def _extract_think(text: str) -> str:
     if not text:
         return ""
-    blocks = []
-    for open_tag, close_tag in (("<think>", "</think>"), ("<analysis>", "</analysis>")):
-        start = 0
-        while True:
-            s = text.find(open_tag, start)
-            if s == -1:
-                break
-            e = text.find(close_tag, s + len(open_tag))
-            if e == -1:
-                blocks.append(text[s + len(open_tag) :].strip())
-                break
-            blocks.append(text[s + len(open_tag) : e].strip())
-            start = e + len(close_tag)
+    blocks = [m.group(2).strip() for m in _THINK_CONTENT_RE.finditer(text)]
     return "\n---\n".join([b for b in blocks if b])
@@ -1,11 +1,16 @@
+import re
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 try:
     import yaml
 except Exception:  # pragma: no cover - optional import guard
     yaml = None
 
+# libyaml's C loader parses an order of magnitude faster than the pure-Python
+# SafeLoader that yaml.safe_load() always uses.
+_SafeLoader = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
 
 @dataclass
 class CaseSpec:
@@ -17,13 +22,16 @@ class CaseSpec:
     source: str = ""
 
 
-_REQUIRED_KEYS = ["module", "feature", "description", "keywords"]
-_ALIASES = {
-    "模块": "module",
-    "功能": "feature",
-    "描述": "description",
-    "关键词": "keywords",
+# Required field -> its Chinese alias, in the order missing fields are reported.
+_CH_OF = {
+    "module": "模块",
+    "feature": "功能",
+    "description": "描述",
+    "keywords": "关键词",
 }
+_MISSING = object()
+# Keywords given as one string are separated by ASCII or full-width commas.
+_KW_SPLIT = re.compile(r"[,，]+")
 
 
 def parse_casespecs_yaml(text: str) -> List[CaseSpec]:
@@ -34,10 +42,26 @@ def parse_casespecs_yaml(text: str) -> List[CaseSpec]:
     2) Top-level dict with `cases: [...]`
     3) Multi-doc YAML separated by '---'
     """
+    return casespecs_from_documents(load_yaml_documents(text))
+
+
+def load_yaml_documents(text: Union[str, bytes]) -> List[Any]:
+    """Parse every YAML document in text, in order.
+
+    Bytes are decoded by PyYAML (UTF-8/UTF-16, BOM-aware).
+    """
     if yaml is None:
         raise RuntimeError("缺少依赖: pyyaml，请先安装依赖")
+    return list(yaml.load_all(text, Loader=_SafeLoader))
+
+
+def libyaml_missing() -> bool:
+    """True when PyYAML is installed without its libyaml C extension."""
+    return yaml is not None and not yaml.__with_libyaml__
 
-    docs = list(yaml.safe_load_all(text))
+
+def casespecs_from_documents(docs: List[Any]) -> List[CaseSpec]:
+    """Build CaseSpec list from already parsed YAML documents."""
     if not docs:
         raise ValueError("输入格式错误：YAML 为空")
 
@@ -62,15 +86,16 @@ def _normalize_keywords(raw: Any) -> List[str]:
     if isinstance(raw, list):
         return [str(x).strip() for x in raw if str(x).strip()]
     if isinstance(raw, str):
-        parts = [p.strip() for p in raw.replace("，", ",").split(",")]
+        parts = [p.strip() for p in _KW_SPLIT.split(raw)]
         return [p for p in parts if p]
     return []
 
 
-def load_yaml(text: str) -> Dict[str, Any]:
-    if yaml is None:
-        raise RuntimeError("缺少依赖: pyyaml，请先安装依赖")
-    data = yaml.safe_load(text)
+def config_from_documents(docs: List[Any]) -> Dict[str, Any]:
+    """Return the single top-level mapping of a parsed config file."""
+    if len(docs) > 1:
+        raise ValueError("策略配置格式错误：仅支持单个 YAML 文档")
+    data = docs[0] if docs else None
     if not isinstance(data, dict):
         raise ValueError("策略配置格式错误：YAML 顶层必须是对象")
     return data
@@ -86,24 +111,26 @@ def _parse_list(items: List[Any]) -> List[CaseSpec]:
 
 
 def _parse_one(data: Dict[str, Any]) -> CaseSpec:
-    # Normalize alias keys (Chinese -> English)
-    normalized = {}
-    for k, v in data.items():
-        key = _ALIASES.get(k, k)
-        normalized[key] = v
-
-    missing = [k for k in _REQUIRED_KEYS if k not in normalized]
+    module = _pick(data, "module")
+    feature = _pick(data, "feature")
+    description = _pick(data, "description")
+    keywords = _pick(data, "keywords")
+    values = (module, feature, description, keywords)
+    missing = [k for k, v in zip(_CH_OF, values) if v is _MISSING]
     if missing:
         raise ValueError(f"缺少必填字段: {', '.join(missing)}")
 
-    module = str(normalized["module"]).strip()
-    feature = str(normalized["feature"]).strip()
-    description = str(normalized["description"]).strip()
-    keywords = _normalize_keywords(normalized["keywords"])
-
     return CaseSpec(
-        module=module,
-        feature=feature,
-        description=description,
-        keywords=keywords,
+        module=str(module).strip(),
+        feature=str(feature).strip(),
+        description=str(description).strip(),
+        keywords=_normalize_keywords(keywords),
     )
+
+
+def _pick(data: Dict[str, Any], key: str) -> Any:
+    # English key first, then its Chinese alias; _MISSING when neither is set.
+    value = data.get(key, _MISSING)
+    if value is _MISSING:
+        value = data.get(_CH_OF[key], _MISSING)
+    return value